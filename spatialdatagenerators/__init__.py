@@ -0,0 +1,18 @@
+"""
+Spatial data generators. Importing the package only loads the standard library, NumPy is imported on the first use
+of the array API or of the numpy engine.
+"""
+from .generators import (BitGenerator, ClusterGenerator, DiagonalGenerator, DiagonalRotGenerator, GaussianGenerator,
+                         Generator, MixtureGenerator, ParcelGenerator, PointGenerator, SierpinskiGenerator,
+                         UniformGenerator, ZipfGenerator, create_generator)
+from .geometry import Box, Geometry, Point
+
+# Names of the array API, which is loaded on first access
+_ARRAY_API = ('generate_points', 'generate_boxes', 'transform_points', 'points_to_boxes')
+
+
+def __getattr__(name):
+    if name in _ARRAY_API:
+        from . import arrays
+        return getattr(arrays, name)
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
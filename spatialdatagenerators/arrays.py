@@ -0,0 +1,73 @@
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+from .generators import POINT_GENERATORS, create_generator
+from .geometry import affine_matrix, box_sizes
+
+
+def transform_points(points, a):
+    """
+    Apply an affine transformation to an (n, dim) array of points, see affine_matrix() for the coefficients
+    """
+    matrix = np.array(affine_matrix(a, points.shape[1]))
+    return points @ matrix[:, :-1].T + matrix[:, -1]
+
+
+def points_to_boxes(points, size):
+    """
+    Build the boxes with their lower corners at the given points
+    :param points: an (n, dim) array
+    :param size: the side length of the boxes, either one for all dimensions or one per dimension
+    :return: an (n, 2 * dim) array of the lower corners followed by the upper corners
+    """
+    return np.ascontiguousarray(np.hstack([points, points + np.array(box_sizes(size, points.shape[1]))]))
+
+
+def generate_points(dist: str, card: int, dim: int = 2, seed: Optional[int] = None,
+                    transform: Optional[Sequence[float]] = None, **params) -> np.ndarray:
+    """
+    Generate points in memory without writing any file
+    :param dist: one of {uniform, diagonal, gaussian, sierpinski, bit, diagonal_rot, cluster, zipf}
+    :param card: the number of points
+    :param dim: the dimensionality of the points
+    :param seed: the seed of the random generator, None for a fresh one
+    :param transform: the coefficients of an affine transformation applied to the points, see affine_matrix()
+    :param params: the distribution parameters, e.g., percentage and buffer for diagonal, clusters and sigma for cluster
+    :return: a C-contiguous (card, dim) float64 array
+    """
+    if dist not in POINT_GENERATORS:
+        raise ValueError('Unknown point distribution type: {}'.format(dist))
+
+    generator = create_generator(dist, card, 'point', dim, None, None, **params)
+    points = generator.generate_array(np.random.default_rng(seed))
+    if transform is not None:
+        points = np.ascontiguousarray(transform_points(points, transform))
+    return points
+
+
+def generate_boxes(dist: str, card: int, dim: int = 2, seed: Optional[int] = None,
+                   size: Union[float, Sequence[float], None] = None, transform: Optional[Sequence[float]] = None,
+                   **params) -> np.ndarray:
+    """
+    Generate boxes in memory without writing any file. For the point distributions, each box has its lower corner
+    at a generated point and the given side lengths.
+    :param dist: one of {uniform, diagonal, gaussian, sierpinski, bit, diagonal_rot, cluster, zipf, parcel}
+    :param card: the number of boxes
+    :param dim: the dimensionality of the boxes
+    :param seed: the seed of the random generator, None for a fresh one
+    :param size: the side length of the boxes, either one for all dimensions or one per dimension. Not used by parcel.
+    :param transform: the coefficients of an affine transformation applied to the lower corners, see affine_matrix().
+    Not used by parcel.
+    :param params: the distribution parameters, e.g., split_range and dither for parcel
+    :return: a C-contiguous (card, 2 * dim) float64 array of the lower corners followed by the upper corners
+    """
+    if dist == 'parcel':
+        generator = create_generator(dist, card, 'rectangle', dim, None, None, **params)
+        return generator.generate_array(np.random.default_rng(seed))
+
+    if size is None:
+        raise ValueError('The box size is required for {} distribution'.format(dist))
+
+    points = generate_points(dist, card, dim, seed, transform, **params)
+    return points_to_boxes(points, size)
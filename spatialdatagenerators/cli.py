@@ -0,0 +1,153 @@
+from optparse import OptionParser
+import os
+import sys
+import time
+
+from .generators import create_generator
+from .geometry import affine_matrix, box_sizes
+from .output import COMPRESSIONS, is_stream, open_output, tcp_address
+
+# The options passed to the generator of each distribution
+DISTRIBUTION_PARAMETERS = {
+    'diagonal': ('percentage', 'buffer'),
+    'bit': ('prob', 'digits'),
+    'parcel': ('split_range', 'dither'),
+    'diagonal_rot': ('percentage', 'buffer', 'angle'),
+    'cluster': ('clusters', 'sigma'),
+    'zipf': ('clusters', 'sigma', 'skew'),
+}
+
+
+def parse_floats(value):
+    return [float(x) for x in value.split(',')]
+
+
+def main(argv=None, output_template='{0}.{1}'):
+    """
+    Generate a dataset and write it to the output
+    :param argv: the command line arguments, sys.argv[1:] by default
+    :param output_template: the path of the output file given its name and extension
+    :return:
+    """
+
+    parser = OptionParser()
+    parser.add_option('-c', '--card', type='int', help='The number of records to generate.')
+    parser.add_option('-g', '--geo', type='string',
+                      help='Geometry type. Currently the generator supports {point, rectangle}.')
+    parser.add_option('-d', '--dim', type='int',
+                      help='The dimensionality of the generated geometries. Sierpinski and parcel distributions only support two dimensions.')
+    parser.add_option('-t', '--dist', type='string',
+                      help='The available distributions are: {uniform, diagonal, gaussian, sierpinski, bit, parcel, diagonal_rot, cluster, zipf}.')
+    parser.add_option('-p', '--percentage', type='float',
+                      help='Diagonal distribution: The percentage (ratio) of the points that are exactly on the line.')
+    parser.add_option('-b', '--buffer', type='float',
+                      help='Diagonal distribution: The size of the buffer around the line where additional geometries are scattered.')
+    parser.add_option('-o', '--output', type='string',
+                      help='Name of the output file, - for stdout, the path of a named pipe, or tcp://host:port or unix:///path/to/socket to stream to a listening socket')
+    parser.add_option('-q', '--prob', type='float',
+                      help='Bit distribution: The probability of setting each bit independently to 1.')
+    parser.add_option('-n', '--digits', type='int',
+                      help='Bit distribution: The number of binary digits after the fraction point.')
+    parser.add_option('-r', '--split_range', type='float',
+                      help='Parcel distribution: The minimum tiling range for splitting a box. r = 0 indicates that all the ranges are allowed while r = 0.5 indicates that a box is always split into half.')
+    parser.add_option('-e', '--dither', type='float',
+                      help='Parcel distribution: The dithering parameter that adds some random noise to the generated rectangles. d = 0 indicates no dithering and d = 1.0 indicates maximum dithering that can shrink rectangles down to a single point.')
+    parser.add_option('--angle', type='float',
+                      help='Diagonal_rot distribution: The angle in degrees of the rotation of the diagonal around the center of the space.')
+    parser.add_option('--clusters', type='int',
+                      help='Cluster and zipf distributions: The number of clusters.')
+    parser.add_option('--sigma', type='float',
+                      help='Cluster and zipf distributions: The standard deviation of the points around the center of their cluster.')
+    parser.add_option('--skew', type='float',
+                      help='Zipf distribution: The exponent of the Zipf law that gives the probability of the i-th cluster, proportional to 1 / i^skew.')
+    parser.add_option('-f', '--format', type='string',
+                      help='Output format. Currently the generator supports {csv, wkt}')
+    parser.add_option('-s', '--size', type='string',
+                      help='Rectangles of the point distributions: The side length of the rectangles, either one value or one per dimension separated by commas.')
+    parser.add_option('-a', '--affine', type='string',
+                      help='Point distributions: The d * (d + 1) coefficients of an affine transformation in row-major order separated by commas, or 6 coefficients to transform the first two dimensions only.')
+    parser.add_option('--seed', type='int', help='The seed of the random generator.')
+    parser.add_option('--engine', type='choice', choices=['auto', 'numpy', 'python'], default='auto',
+                      help='python generates one record at a time and does not import NumPy, numpy generates vectorized batches. auto uses numpy when it is installed, except for datasets of less than 50000 records without --seed. The engines give different datasets for the same seed.')
+    parser.add_option('-z', '--compression', type='choice', choices=sorted(COMPRESSIONS),
+                      help='Compress the output file with one of {}.'.format(', '.join(sorted(COMPRESSIONS))))
+
+    (options, args) = parser.parse_args(argv)
+    options_dict = vars(options)
+    print(options_dict, file=sys.stderr)
+    card, geo, dim, dist, output, output_format = options_dict['card'], options_dict['geo'], options_dict['dim'], \
+                                                  options_dict['dist'], options_dict['output'], options_dict['format']
+
+    if card is None:
+        print('Please specify the number of records.', file=sys.stderr)
+        sys.exit(1)
+
+    if dim is None:
+        print('Please specify the dimensionality.', file=sys.stderr)
+        sys.exit(1)
+
+    if output is None:
+        print('Please specify the output.', file=sys.stderr)
+        sys.exit(1)
+
+    if geo not in ('point', 'rectangle'):
+        print('Please check the geometry type.', file=sys.stderr)
+        sys.exit(1)
+
+    if output_format not in ('csv', 'wkt'):
+        print('Please check the output format.', file=sys.stderr)
+        sys.exit(1)
+
+    if output_format == 'wkt' and geo == 'rectangle' and dim != 2:
+        print('WKT output is only supported for two-dimensional rectangles.', file=sys.stderr)
+        sys.exit(1)
+
+    if options.compression is not None and is_stream(output):
+        print('Please write to a file to compress the output.', file=sys.stderr)
+        sys.exit(1)
+
+    if geo == 'rectangle' and dist != 'parcel' and options.size is None:
+        print('Please specify the size of the rectangles.', file=sys.stderr)
+        sys.exit(1)
+
+    size = None if options.size is None else parse_floats(options.size)
+    if size is not None and len(size) == 1:
+        size = size[0]
+    transform = None if options.affine is None else parse_floats(options.affine)
+
+    params = {name: options_dict[name] for name in DISTRIBUTION_PARAMETERS.get(dist, ())}
+    for name, value in params.items():
+        if value is None:
+            print('Please specify the {} of {} distribution.'.format(name, dist), file=sys.stderr)
+            sys.exit(1)
+
+    try:
+        generator = create_generator(dist, card, geo, dim, output, output_format, **params)
+        if transform is not None:
+            affine_matrix(transform, dim)
+        if size is not None:
+            box_sizes(size, dim)
+        if output.startswith('tcp://'):
+            tcp_address(output)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+
+    start_time = time.time()
+    try:
+        f = open_output(output, output_format, output_template, options.compression)
+    except (OSError, ValueError) as e:
+        print('Cannot open the output {}: {}'.format(output, e), file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        generator.write(f, options.engine, options.seed, size, transform)
+        f.close()
+    except (BrokenPipeError, ConnectionResetError):
+        # The reader stopped early. Point stdout to devnull so that flushing it at exit does not fail again.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
+
+    elapsed_time = time.time() - start_time
+    print('Generated {} records in {} seconds'.format(card, elapsed_time), file=sys.stderr)
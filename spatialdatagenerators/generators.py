@@ -0,0 +1,592 @@
+from abc import ABC, abstractmethod
+import importlib.util
+import math
+import queue
+import random as rand
+
+from .geometry import Box, Point, affine_matrix, box_sizes
+from .output import open_output, write_array
+
+# Number of candidate records drawn per vectorized batch by the numpy engine
+BATCH_SIZE = 1 << 20
+
+# Datasets smaller than this are generated by the python engine when the engine is auto, since importing NumPy
+# takes longer than generating them one record at a time
+NUMPY_MIN_CARD = 50000
+
+
+class Generator(ABC):
+
+    def __init__(self, card, geo, dim, dist, output, output_format):
+        self.card = card
+        self.geo = geo
+        self.dim = dim
+        self.dist = dist
+        self.output = output
+        self.output_format = output_format
+        # The random module by default, write() replaces it with a private Random of the given seed
+        self.random = rand
+
+    def bernoulli(self, p):
+        return 1 if self.random.random() < p else 0
+
+    def normal(self, mu, sigma):
+        u1, u2 = self.random.random(), self.random.random()
+        return mu + sigma * math.sqrt(-2 * math.log(u1)) * math.sin(2 * math.pi * u2)
+
+    def is_valid_point(self, point):
+        for x in point.coordinates:
+            if not (0 <= x <= 1):
+                return False
+        return True
+
+    @abstractmethod
+    def generate(self):
+        pass
+
+    def generate_and_write(self, engine='auto', seed=None, size=None, transform=None):
+        """
+        Generate the geometries and write them to the output, see open_output() and write()
+        """
+        f = open_output(self.output, self.output_format)
+        self.write(f, engine, seed, size, transform)
+        f.close()
+
+    def write(self, f, engine='auto', seed=None, size=None, transform=None):
+        """
+        Generate the geometries and write them to a text stream
+        :param f: a writable text stream
+        :param engine: python to generate one record at a time, numpy to generate vectorized batches, or auto
+        :param seed: the seed of the random generator, None for a fresh one
+        :param size: the side length of the rectangles generated from points, see box_sizes()
+        :param transform: the coefficients of an affine transformation applied to the points, see affine_matrix()
+        """
+        if resolve_engine(engine, self.card, seed) == 'numpy':
+            import numpy as np
+            self.write_arrays(f, np.random.default_rng(seed), size, transform)
+        else:
+            self.random = rand.Random(seed)
+            self.write_records(f, size, transform)
+
+    def write_records(self, f, size=None, transform=None):
+        for g in self.generate():
+            f.write('{0}\n'.format(g.to_string(self.output_format)))
+
+    @abstractmethod
+    def write_arrays(self, f, rng, size=None, transform=None):
+        pass
+
+
+class PointGenerator(Generator):
+
+    def __init__(self, card, geo, dim, dist, output, output_format):
+        super(PointGenerator, self).__init__(card, geo, dim, dist, output, output_format)
+
+    def generate(self):
+        geometries = []
+        prev_point = None
+
+        i = 0
+        while i < self.card:
+            point = self.generate_point(i, prev_point)
+
+            if self.is_valid_point(point):
+                prev_point = point
+                geometries.append(prev_point)
+                i = i + 1
+
+        return geometries
+
+    def rectangle_sizes(self, size):
+        if self.geo != 'rectangle':
+            return None
+        if size is None:
+            raise ValueError('The rectangle size is required for {} distribution'.format(self.dist))
+        return box_sizes(size, self.dim)
+
+    def write_records(self, f, size=None, transform=None):
+        matrix = None if transform is None else affine_matrix(transform, self.dim)
+        sizes = self.rectangle_sizes(size)
+        prev_point = None
+
+        i = 0
+        while i < self.card:
+            point = self.generate_point(i, prev_point)
+
+            if self.is_valid_point(point):
+                prev_point = point
+                if matrix is not None:
+                    point = point.transform(matrix)
+                geometry = point if sizes is None else Box(point.coordinates, sizes)
+                f.write('{0}\n'.format(geometry.to_string(self.output_format)))
+                i = i + 1
+
+    def write_arrays(self, f, rng, size=None, transform=None):
+        from .arrays import points_to_boxes, transform_points
+
+        sizes = self.rectangle_sizes(size)
+        for points in self.generate_arrays(rng):
+            if transform is not None:
+                points = transform_points(points, transform)
+            if sizes is not None:
+                points = points_to_boxes(points, sizes)
+            write_array(f, points, self.output_format, self.geo)
+
+    def generate_arrays(self, rng, batch_size=BATCH_SIZE):
+        """
+        Generate the points in batches, rejecting the ones outside the unit cube as generate() does
+        :param rng: numpy random Generator
+        :param batch_size: the maximum number of points per batch
+        :return: an iterator of (n, dim) arrays holding card points in total
+        """
+        import numpy as np
+
+        remaining = self.card
+        while remaining > 0:
+            points = self.generate_batch(rng, min(remaining, batch_size))
+            points = points[np.all((0 <= points) & (points <= 1), axis=1)]
+            if len(points) > 0:
+                remaining = remaining - len(points)
+                yield points
+
+    def generate_array(self, rng):
+        import numpy as np
+
+        arrays = list(self.generate_arrays(rng))
+        if not arrays:
+            return np.empty((0, self.dim))
+        return np.ascontiguousarray(np.concatenate(arrays))
+
+    @abstractmethod
+    def generate_point(self, i, prev_point):
+        pass
+
+    @abstractmethod
+    def generate_batch(self, rng, n):
+        """
+        Generate n candidate points at once, some of which may fall outside the unit cube
+        :param rng: numpy random Generator
+        :param n: the number of points
+        :return: an (n, dim) array
+        """
+        pass
+
+
+class UniformGenerator(PointGenerator):
+
+    def __init__(self, card, geo, dim, dist, output, output_format):
+        super(UniformGenerator, self).__init__(card, geo, dim, dist, output, output_format)
+
+    def generate_point(self, i, prev_point):
+        coordinates = [self.random.random() for d in range(self.dim)]
+        return Point(coordinates)
+
+    def generate_batch(self, rng, n):
+        return rng.random((n, self.dim))
+
+
+class DiagonalGenerator(PointGenerator):
+
+    def __init__(self, card, geo, dim, dist, output, output_format, percentage, buffer):
+        super(DiagonalGenerator, self).__init__(card, geo, dim, dist, output, output_format)
+        self.percentage = percentage
+        self.buffer = buffer
+
+    def generate_point(self, i, prev_point):
+        if self.bernoulli(self.percentage) == 1:
+            coordinates = [self.random.random()] * self.dim
+        else:
+            c = self.random.random()
+            d = self.normal(0, self.buffer / 5)
+
+            coordinates = [(c + (1 - 2 * (x % 2)) * d / math.sqrt(2)) for x in range(self.dim)]
+        return Point(coordinates)
+
+    def generate_batch(self, rng, n):
+        import numpy as np
+
+        on_line = rng.random(n) < self.percentage
+        c = rng.random(n)
+        d = np.where(on_line, 0.0, rng.normal(0, self.buffer / 5, n))
+        signs = 1 - 2 * (np.arange(self.dim) % 2)
+        return c[:, np.newaxis] + d[:, np.newaxis] * signs / math.sqrt(2)
+
+
+class GaussianGenerator(PointGenerator):
+
+    def __init__(self, card, geo, dim, dist, output, output_format):
+        super(GaussianGenerator, self).__init__(card, geo, dim, dist, output, output_format)
+
+    def generate_point(self, i, prev_point):
+        coordinates = [self.normal(0.5, 0.1) for d in range(self.dim)]
+        return Point(coordinates)
+
+    def generate_batch(self, rng, n):
+        return rng.normal(0.5, 0.1, (n, self.dim))
+
+
+class SierpinskiGenerator(PointGenerator):
+
+    def __init__(self, card, geo, dim, dist, output, output_format):
+        super(SierpinskiGenerator, self).__init__(card, geo, dim, dist, output, output_format)
+
+    def generate_point(self, i, prev_point):
+        if i == 0:
+            return Point([0.0, 0.0])
+        elif i == 1:
+            return Point([1.0, 0.0])
+        elif i == 2:
+            return Point([0.5, math.sqrt(3) / 2])
+        else:
+            d = self.dice(5)
+
+            if d == 1 or d == 2:
+                return self.get_middle_point(prev_point, Point([0.0, 0.0]))
+            elif d == 3 or d == 4:
+                return self.get_middle_point(prev_point, Point([1.0, 0.0]))
+            else:
+                return self.get_middle_point(prev_point, Point([0.5, math.sqrt(3) / 2]))
+
+    def dice(self, n):
+        return math.floor(self.random.random() * n) + 1
+
+    def get_middle_point(self, point1, point2):
+        middle_point_coords = []
+        for i in range(len(point1.coordinates)):
+            middle_point_coords.append((point1.coordinates[i] + point2.coordinates[i]) / 2)
+        return Point(middle_point_coords)
+
+    def generate_batch(self, rng, n):
+        """
+        Generate a chain of n points that starts from the three vertices of the triangle, as generate() does
+        """
+        import numpy as np
+
+        vertices = np.array([[0.0, 0.0], [1.0, 0.0], [0.5, math.sqrt(3) / 2]])
+        first = vertices[:n]
+        return np.concatenate([first, self.generate_middle_points(rng, n - len(first), vertices[2])])
+
+    def generate_middle_points(self, rng, n, prev_point):
+        """
+        Continue the chain after prev_point with n points
+        :return: an (n, 2) array
+        """
+        import numpy as np
+
+        # Each point is the middle of the previous one and a random vertex, i.e., p[k] = p[k - 1] / 2 + v[k] / 2.
+        # Unrolling the recurrence, the contribution of a vertex halves with every step, so it vanishes in double
+        # precision after 64 steps and each batch is a short sum of shifted copies of the drawn vertices.
+        vertices = np.array([[0.0, 0.0], [1.0, 0.0], [0.5, math.sqrt(3) / 2]])
+        d = np.floor(rng.random(n) * 5).astype(np.intp)
+        v = vertices[np.array([0, 0, 1, 1, 2])[d]]
+        points = np.zeros((n, 2))
+        for lag in range(min(n, 64)):
+            points[lag:] += v[:n - lag] * math.pow(2, -(lag + 1))
+        head = min(n, 64)
+        points[:head] += np.asarray(prev_point) * np.power(2.0, -np.arange(1, head + 1))[:, np.newaxis]
+        return points
+
+    def generate_arrays(self, rng, batch_size=BATCH_SIZE):
+        # Only the first batch starts from the vertices, the next ones continue the chain
+        remaining = self.card
+        points = None
+        while remaining > 0:
+            n = min(remaining, batch_size)
+            if points is None:
+                points = self.generate_batch(rng, n)
+            else:
+                points = self.generate_middle_points(rng, n, points[-1])
+            remaining = remaining - n
+            yield points
+
+
+class BitGenerator(PointGenerator):
+
+    def __init__(self, card, geo, dim, dist, output, output_format, prob, digits):
+        super(BitGenerator, self).__init__(card, geo, dim, dist, output, output_format)
+        self.prob = prob
+        self.digits = int(digits)
+
+    def generate_point(self, i, prev_point):
+        coordinates = [self.bit() for d in range(self.dim)]
+        return Point(coordinates)
+
+    def bit(self):
+        num = 0.0
+        for i in range(1, self.digits + 1):
+            c = self.bernoulli(self.prob)
+            num = num + c / (math.pow(2, i))
+        return num
+
+    def generate_batch(self, rng, n):
+        import numpy as np
+
+        points = np.zeros((n, self.dim))
+        for i in range(1, self.digits + 1):
+            points += (rng.random((n, self.dim)) < self.prob) / math.pow(2, i)
+        return points
+
+
+class DiagonalRotGenerator(DiagonalGenerator):
+
+    def __init__(self, card, geo, dim, dist, output, output_format, percentage, buffer, angle):
+        super(DiagonalRotGenerator, self).__init__(card, geo, dim, dist, output, output_format, percentage, buffer)
+        self.angle = angle
+
+        # Rotate the first two coordinates by angle degrees around the center of the unit square
+        cos, sin = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+        self.rotation = [cos, -sin, 0.5 - 0.5 * cos + 0.5 * sin, sin, cos, 0.5 - 0.5 * sin - 0.5 * cos]
+        self.matrix = affine_matrix(self.rotation, dim)
+
+    def generate_point(self, i, prev_point):
+        return super(DiagonalRotGenerator, self).generate_point(i, prev_point).transform(self.matrix)
+
+    def generate_batch(self, rng, n):
+        from .arrays import transform_points
+
+        return transform_points(super(DiagonalRotGenerator, self).generate_batch(rng, n), self.rotation)
+
+
+class MixtureGenerator(PointGenerator):
+    """
+    Points scattered with a normal distribution around cluster centers, which are uniformly distributed in the unit
+    cube. Each point first selects its cluster in constant time, so a batch costs the same whatever the number of
+    clusters.
+    """
+
+    def __init__(self, card, geo, dim, dist, output, output_format, clusters, sigma):
+        super(MixtureGenerator, self).__init__(card, geo, dim, dist, output, output_format)
+        if int(clusters) < 1:
+            raise ValueError('The number of clusters of {} distribution must be at least 1'.format(dist))
+        if sigma < 0:
+            raise ValueError('The standard deviation of {} distribution must not be negative'.format(dist))
+
+        self.clusters = int(clusters)
+        self.sigma = sigma
+        # Drawn at the start of each run by the random generator of the engine, so the seed also places the clusters
+        self.centers = None
+
+    def generate(self):
+        self.centers = None
+        return super(MixtureGenerator, self).generate()
+
+    def write_records(self, f, size=None, transform=None):
+        self.centers = None
+        super(MixtureGenerator, self).write_records(f, size, transform)
+
+    def generate_arrays(self, rng, batch_size=BATCH_SIZE):
+        self.centers = None
+        return super(MixtureGenerator, self).generate_arrays(rng, batch_size)
+
+    @abstractmethod
+    def select_cluster(self):
+        pass
+
+    @abstractmethod
+    def select_clusters(self, rng, n):
+        pass
+
+    def generate_point(self, i, prev_point):
+        if self.centers is None:
+            self.centers = [[self.random.random() for d in range(self.dim)] for c in range(self.clusters)]
+
+        center = self.centers[self.select_cluster()]
+        return Point([self.normal(x, self.sigma) for x in center])
+
+    def generate_batch(self, rng, n):
+        import numpy as np
+
+        if self.centers is None:
+            self.centers = rng.random((self.clusters, self.dim))
+
+        centers = np.asarray(self.centers)
+        return centers[self.select_clusters(rng, n)] + rng.normal(0, self.sigma, (n, self.dim))
+
+
+class ClusterGenerator(MixtureGenerator):
+
+    def __init__(self, card, geo, dim, dist, output, output_format, clusters, sigma):
+        super(ClusterGenerator, self).__init__(card, geo, dim, dist, output, output_format, clusters, sigma)
+
+    def select_cluster(self):
+        return self.random.randrange(self.clusters)
+
+    def select_clusters(self, rng, n):
+        return rng.integers(self.clusters, size=n)
+
+
+class ZipfGenerator(MixtureGenerator):
+
+    def __init__(self, card, geo, dim, dist, output, output_format, clusters, sigma, skew):
+        super(ZipfGenerator, self).__init__(card, geo, dim, dist, output, output_format, clusters, sigma)
+        if skew < 0:
+            raise ValueError('The skew of {} distribution must not be negative'.format(dist))
+
+        self.skew = skew
+        self.probabilities, self.aliases = alias_table(self.weights())
+
+    def weights(self):
+        return [1.0 / math.pow(i, self.skew) for i in range(1, self.clusters + 1)]
+
+    def select_cluster(self):
+        c = self.random.randrange(self.clusters)
+        return c if self.random.random() < self.probabilities[c] else self.aliases[c]
+
+    def select_clusters(self, rng, n):
+        import numpy as np
+
+        c = rng.integers(self.clusters, size=n)
+        return np.where(rng.random(n) < np.asarray(self.probabilities)[c], c, np.asarray(self.aliases)[c])
+
+
+class ParcelGenerator(Generator):
+
+    def __init__(self, card, geo, dim, dist, output, output_format, split_range, dither):
+        super(ParcelGenerator, self).__init__(card, geo, dim, dist, output, output_format)
+        self.split_range = split_range
+        self.dither = dither
+
+    def generate(self):
+        geometries = []
+        box = Box([0.0, 0.0], [1.0, 1.0])
+        boxes = queue.Queue(self.card)
+        boxes.put(box)
+
+        while boxes.qsize() < self.card:
+            # Dequeue the queue to get a box
+            b = boxes.get()
+            (x, y), (w, h) = b.coordinates, b.sizes
+
+            if w > h:
+                # Split vertically if width is bigger than height
+                split_size = w * self.random.uniform(self.split_range, 1 - self.split_range)
+                b1 = Box([x, y], [split_size, h])
+                b2 = Box([x + split_size, y], [w - split_size, h])
+            else:
+                # Split horizontally if width is less than height
+                split_size = h * self.random.uniform(self.split_range, 1 - self.split_range)
+                b1 = Box([x, y], [w, split_size])
+                b2 = Box([x, y + split_size], [w, h - split_size])
+
+            boxes.put(b1)
+            boxes.put(b2)
+
+        while not boxes.empty():
+            b = boxes.get()
+            b.sizes = [size * (1.0 - self.random.uniform(0.0, self.dither)) for size in b.sizes]
+            geometries.append(b)
+
+        return geometries
+
+    def generate_array(self, rng):
+        """
+        Generate the boxes with the same splitting order as generate(), one queue level at a time
+        :param rng: numpy random Generator
+        :return: a (card, 4) array of x1, y1, x2, y2
+        """
+        import numpy as np
+
+        # Columns are x, y, w, h
+        boxes = np.array([[0.0, 0.0, 1.0, 1.0]])
+
+        while len(boxes) < self.card:
+            # Dequeue as many boxes as needed, the children are enqueued after the remaining boxes
+            k = min(len(boxes), self.card - len(boxes))
+            b, rest = boxes[:k], boxes[k:]
+            vertical = b[:, 2] > b[:, 3]
+            side = np.where(vertical, b[:, 2], b[:, 3])
+            split_size = side * rng.uniform(self.split_range, 1 - self.split_range, k)
+
+            b1 = b.copy()
+            b2 = b.copy()
+            b1[:, 2] = np.where(vertical, split_size, b[:, 2])
+            b1[:, 3] = np.where(vertical, b[:, 3], split_size)
+            b2[:, 0] = np.where(vertical, b[:, 0] + split_size, b[:, 0])
+            b2[:, 1] = np.where(vertical, b[:, 1], b[:, 1] + split_size)
+            b2[:, 2] = np.where(vertical, b[:, 2] - split_size, b[:, 2])
+            b2[:, 3] = np.where(vertical, b[:, 3], b[:, 3] - split_size)
+
+            boxes = np.concatenate([rest, np.stack([b1, b2], axis=1).reshape(-1, 4)])
+
+        boxes = boxes[:self.card]
+        boxes[:, 2:] *= 1.0 - rng.uniform(0.0, self.dither, (len(boxes), 2))
+        boxes[:, 2:] += boxes[:, :2]
+        return np.ascontiguousarray(boxes)
+
+    def write_arrays(self, f, rng, size=None, transform=None):
+        write_array(f, self.generate_array(rng), self.output_format, 'rectangle')
+
+
+def alias_table(weights):
+    """
+    Build the tables of Walker's alias method, which selects an index with probability proportional to its weight by
+    drawing a uniform index i and keeping it with probability probabilities[i], or taking aliases[i] otherwise
+    :param weights: a list of non-negative weights
+    :return: the lists of probabilities and aliases
+    """
+    k = len(weights)
+    total = sum(weights)
+    scaled = [w * k / total for w in weights]
+    probabilities, aliases = [1.0] * k, list(range(k))
+
+    small = [i for i in range(k) if scaled[i] < 1]
+    large = [i for i in range(k) if scaled[i] >= 1]
+    while small and large:
+        i, j = small.pop(), large.pop()
+        # Fill the rest of the bucket of i with j
+        probabilities[i], aliases[i] = scaled[i], j
+        scaled[j] = scaled[j] + scaled[i] - 1
+        if scaled[j] < 1:
+            small.append(j)
+        else:
+            large.append(j)
+
+    return probabilities, aliases
+
+
+POINT_GENERATORS = {
+    'uniform': UniformGenerator,
+    'diagonal': DiagonalGenerator,
+    'gaussian': GaussianGenerator,
+    'sierpinski': SierpinskiGenerator,
+    'bit': BitGenerator,
+    'diagonal_rot': DiagonalRotGenerator,
+    'cluster': ClusterGenerator,
+    'zipf': ZipfGenerator,
+}
+
+
+def create_generator(dist, card, geo, dim, output, output_format, **params):
+    """
+    Create the generator of a distribution, the extra parameters are passed to its constructor by name
+    :return: a Generator
+    """
+    if dist in ('sierpinski', 'parcel') and dim != 2:
+        raise ValueError('Currently we only support 2 dimensions for {} distribution'.format(dist))
+
+    if dist == 'parcel':
+        return ParcelGenerator(card, geo, dim, dist, output, output_format, **params)
+    elif dist in POINT_GENERATORS:
+        return POINT_GENERATORS[dist](card, geo, dim, dist, output, output_format, **params)
+    else:
+        raise ValueError('Unknown distribution type: {}'.format(dist))
+
+
+def resolve_engine(engine, card, seed=None):
+    """
+    Choose the engine that generates a dataset. The engines draw from different random generators, so auto only
+    looks at the number of records when there is no seed, and a given seed always gives the same dataset.
+    :param engine: python, numpy, or auto to use numpy when it is installed, unless there is no seed and the dataset
+    is small
+    :param card: the number of records
+    :param seed: the seed of the random generator
+    :return: python or numpy
+    """
+    if engine == 'auto':
+        if (seed is None and card < NUMPY_MIN_CARD) or importlib.util.find_spec('numpy') is None:
+            return 'python'
+        return 'numpy'
+    elif engine in ('python', 'numpy'):
+        return engine
+    else:
+        raise ValueError('Unknown engine: {}'.format(engine))
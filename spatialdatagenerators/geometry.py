@@ -0,0 +1,98 @@
+from abc import ABC, abstractmethod
+import sys
+
+
+class Geometry(ABC):
+
+    def to_string(self, output_format):
+        if output_format == 'csv':
+            return self.to_csv_string()
+        elif output_format == 'wkt':
+            return self.to_wkt_string()
+        else:
+            print('Please check the output format.', file=sys.stderr)
+            sys.exit(1)
+
+    @abstractmethod
+    def to_csv_string(self):
+        pass
+
+    @abstractmethod
+    def to_wkt_string(self):
+        pass
+
+
+class Point(Geometry):
+
+    def __init__(self, coordinates):
+        self.coordinates = coordinates
+
+    def to_csv_string(self):
+        return ','.join(str(x) for x in self.coordinates)
+
+    def to_wkt_string(self):
+        return 'POINT ({0})'.format(' '.join(str(x) for x in self.coordinates))
+
+    def transform(self, matrix):
+        """
+        Apply an affine transformation, see affine_matrix()
+        :return: the transformed Point
+        """
+        return Point([sum(m * x for m, x in zip(row, self.coordinates)) + row[-1] for row in matrix])
+
+
+class Box(Geometry):
+
+    def __init__(self, coordinates, sizes):
+        self.coordinates = coordinates
+        self.sizes = sizes
+
+    def upper_coordinates(self):
+        return [x + size for x, size in zip(self.coordinates, self.sizes)]
+
+    def to_csv_string(self):
+        return ','.join(str(x) for x in self.coordinates + self.upper_coordinates())
+
+    def to_wkt_string(self):
+        if len(self.coordinates) != 2:
+            print('WKT output is only supported for two-dimensional rectangles.', file=sys.stderr)
+            sys.exit(1)
+
+        (x1, y1), (x2, y2) = self.coordinates, self.upper_coordinates()
+        return 'POLYGON (({} {}, {} {}, {} {}, {} {}, {} {}))'.format(x1, y1, x2, y1, x2, y2, x1, y2, x1, y1)
+
+
+def affine_matrix(a, dim):
+    """
+    Build the matrix of an affine transformation of dim-dimensional points
+    :param a: the dim * (dim + 1) coefficients in row-major order, or the 6 coefficients of a two-dimensional
+    transformation that only applies to the first two coordinates
+    :param dim: the dimensionality of the points
+    :return: dim rows of dim + 1 values whose last column is the translation
+    """
+    a = [float(x) for x in a]
+    if len(a) == dim * (dim + 1):
+        return [a[i * (dim + 1):(i + 1) * (dim + 1)] for i in range(dim)]
+    elif len(a) == 6 and dim > 2:
+        matrix = [[1.0 if j == i else 0.0 for j in range(dim + 1)] for i in range(dim)]
+        matrix[0][0], matrix[0][1], matrix[0][dim] = a[0:3]
+        matrix[1][0], matrix[1][1], matrix[1][dim] = a[3:6]
+        return matrix
+    else:
+        raise ValueError('Expected {} affine coefficients for {} dimensions, got {}'.format(
+            dim * (dim + 1), dim, len(a)))
+
+
+def box_sizes(size, dim):
+    """
+    The side lengths of dim-dimensional boxes
+    :param size: either one side length for all dimensions or one per dimension
+    :return: a list of dim side lengths
+    """
+    if isinstance(size, (int, float)):
+        return [float(size)] * dim
+
+    sizes = [float(x) for x in size]
+    if len(sizes) != dim:
+        raise ValueError('Expected 1 or {} box sizes, got {}'.format(dim, len(sizes)))
+    return sizes
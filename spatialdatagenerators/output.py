@@ -0,0 +1,113 @@
+import importlib
+import io
+import os
+import stat
+import sys
+
+# Number of rows formatted at once when writing an array
+WRITE_BATCH_SIZE = 1 << 16
+
+# Size of the write buffer of the output streams
+OUTPUT_BUFFER_SIZE = 1 << 22
+
+# Compression codecs of the output files, their modules are only imported when selected
+COMPRESSIONS = {
+    'gzip': ('gzip', 'gz'),
+    'bz2': ('bz2', 'bz2'),
+    'xz': ('lzma', 'xz'),
+}
+
+
+def is_stream(output):
+    """
+    Whether the output is stdout, a socket or a named pipe rather than a file
+    """
+    return output == '-' or output.startswith('tcp://') or output.startswith('unix://') or \
+        (os.path.exists(output) and stat.S_ISFIFO(os.stat(output).st_mode))
+
+
+def tcp_address(output):
+    """
+    The host and port of a tcp://host:port output
+    """
+    host, _, port = output[len('tcp://'):].rpartition(':')
+    if not host or not port.isdigit():
+        raise ValueError('Expected tcp://host:port, got {}'.format(output))
+    return host, int(port)
+
+
+def open_output(output, output_format, template='{0}.{1}', compression=None):
+    """
+    Open a buffered text stream for the generated records. Writes block while the reader is not consuming, so a
+    loader on the other end of a pipe or socket throttles the generator.
+    :param output: '-' for stdout, tcp://host:port or unix:///path/to/socket to connect to a listening socket,
+    the path of an existing named pipe, or the name of the output file otherwise
+    :param output_format: the extension of the output file
+    :param template: the path of the output file given its name and extension
+    :param compression: None or one of {gzip, bz2, xz} to compress the output file
+    :return: a writable text stream
+    """
+    if compression is not None and is_stream(output):
+        raise ValueError('Compression is only supported for output files')
+
+    if output == '-':
+        sys.stdout.flush()
+        raw = io.FileIO(sys.stdout.fileno(), 'w', closefd=False)
+        return io.TextIOWrapper(io.BufferedWriter(raw, OUTPUT_BUFFER_SIZE), encoding='utf8')
+
+    if output.startswith('tcp://') or output.startswith('unix://'):
+        import socket
+
+        if output.startswith('tcp://'):
+            sock = socket.create_connection(tcp_address(output))
+        else:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(output[len('unix://'):])
+        f = sock.makefile('w', buffering=OUTPUT_BUFFER_SIZE, encoding='utf8')
+        # The connection stays open until the file is closed
+        sock.close()
+        return f
+
+    if os.path.exists(output) and stat.S_ISFIFO(os.stat(output).st_mode):
+        return open(output, 'w', buffering=OUTPUT_BUFFER_SIZE, encoding='utf8')
+
+    output_filename = template.format(output, output_format)
+    if compression is None:
+        return open(output_filename, 'w', buffering=OUTPUT_BUFFER_SIZE, encoding='utf8')
+
+    if compression not in COMPRESSIONS:
+        raise ValueError('Unknown compression: {}'.format(compression))
+    module_name, extension = COMPRESSIONS[compression]
+    module = importlib.import_module(module_name)
+    return module.open('{}.{}'.format(output_filename, extension), 'wt', encoding='utf8')
+
+
+def format_array(array, output_format, geo='point'):
+    """
+    Format the rows of an array as text lines, the same as Geometry.to_string() does for each record
+    :param array: an (n, dim) array of points, or an (n, 2 * dim) array of boxes for the rectangle geometry type
+    :param output_format: csv or wkt
+    :param geo: point or rectangle
+    :return: a string of n lines
+    """
+    if output_format == 'csv':
+        template = ','.join(['%r'] * array.shape[1]) + '\n'
+    elif output_format == 'wkt' and geo == 'point':
+        template = 'POINT ({})\n'.format(' '.join(['%r'] * array.shape[1]))
+    elif output_format == 'wkt' and array.shape[1] == 4:
+        template = 'POLYGON ((%r %r, %r %r, %r %r, %r %r, %r %r))\n'
+        array = array[:, [0, 1, 2, 1, 2, 3, 0, 3, 0, 1]]
+    elif output_format == 'wkt':
+        raise ValueError('WKT output is only supported for two-dimensional rectangles')
+    else:
+        raise ValueError('Unknown output format: {}'.format(output_format))
+
+    return ''.join([template % tuple(row) for row in array.tolist()])
+
+
+def write_array(f, array, output_format, geo='point'):
+    """
+    Write the rows of an array to a text stream, see format_array()
+    """
+    for start in range(0, len(array), WRITE_BATCH_SIZE):
+        f.write(format_array(array[start:start + WRITE_BATCH_SIZE], output_format, geo))
@@ -0,0 +1,145 @@
+import gzip
+import os
+import socket
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from spatialdatagenerators import cli
+
+
+def run(argv, tmp_path):
+    cli.main(argv, output_template=str(tmp_path / '{0}.{1}'))
+
+
+def read_rows(text):
+    return [[float(x) for x in line.split(',')] for line in text.splitlines()]
+
+
+@pytest.mark.parametrize('engine', ['python', 'numpy'])
+def test_file_output(tmp_path, engine):
+    if engine == 'numpy':
+        pytest.importorskip('numpy')
+
+    run(['-c', '100', '-g', 'rectangle', '-d', '3', '-t', 'uniform', '-f', 'csv', '-s', '0.1', '-o', 'data',
+         '--seed', '1', '--engine', engine], tmp_path)
+    rows = read_rows((tmp_path / 'data.csv').read_text())
+    assert len(rows) == 100
+    assert all(len(row) == 6 and row[3] - row[0] == pytest.approx(0.1) for row in rows)
+
+
+def test_seed_does_not_depend_on_the_card(tmp_path):
+    pytest.importorskip('numpy')
+
+    run(['-c', '3', '-g', 'point', '-d', '2', '-t', 'gaussian', '-f', 'csv', '-o', 'small', '--seed', '7'], tmp_path)
+    run(['-c', '60000', '-g', 'point', '-d', '2', '-t', 'gaussian', '-f', 'csv', '-o', 'large', '--seed', '7'],
+        tmp_path)
+    small = (tmp_path / 'small.csv').read_text().splitlines()
+    large = (tmp_path / 'large.csv').read_text().splitlines()
+    assert small == large[:3]
+
+
+def test_compressed_output(tmp_path):
+    run(['-c', '100', '-g', 'point', '-d', '2', '-t', 'uniform', '-f', 'csv', '-o', 'data', '-z', 'gzip'], tmp_path)
+    with gzip.open(str(tmp_path / 'data.csv.gz'), 'rt') as f:
+        assert len(read_rows(f.read())) == 100
+
+
+def test_stdout_output():
+    argv = ['-c', '50', '-g', 'point', '-d', '2', '-t', 'gaussian', '-f', 'wkt', '-o', '-', '--seed', '1',
+            '--engine', 'python']
+    result = subprocess.run([sys.executable, '-m', 'spatialdatagenerators'] + argv, capture_output=True, text=True)
+    assert result.returncode == 0
+    lines = result.stdout.splitlines()
+    assert len(lines) == 50 and all(line.startswith('POINT (') for line in lines)
+
+
+def test_socket_output(tmp_path):
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen(1)
+    received = []
+
+    def accept():
+        connection, _ = server.accept()
+        with connection, connection.makefile('r', encoding='utf8') as f:
+            received.append(f.read())
+
+    thread = threading.Thread(target=accept)
+    thread.start()
+    try:
+        run(['-c', '200', '-g', 'point', '-d', '2', '-t', 'diagonal', '-p', '0.5', '-b', '0.5', '-f', 'csv',
+             '-o', 'tcp://127.0.0.1:{}'.format(server.getsockname()[1]), '--engine', 'python'], tmp_path)
+        thread.join(10)
+    finally:
+        server.close()
+
+    assert len(read_rows(received[0])) == 200
+
+
+
+@pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason='Named pipes are not supported')
+def test_fifo_output(tmp_path):
+    fifo = str(tmp_path / 'fifo')
+    os.mkfifo(fifo)
+    received = []
+
+    def read():
+        with open(fifo, encoding='utf8') as f:
+            received.append(f.read())
+
+    thread = threading.Thread(target=read)
+    thread.start()
+    run(['-c', '200', '-g', 'point', '-d', '2', '-t', 'uniform', '-f', 'csv', '-o', fifo, '--engine', 'python'],
+        tmp_path)
+    thread.join(10)
+
+    assert len(read_rows(received[0])) == 200
+
+
+def test_unreachable_socket(tmp_path, capsys):
+    # Nothing listens on a port once its socket is closed
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    port = server.getsockname()[1]
+    server.close()
+
+    with pytest.raises(SystemExit) as e:
+        run(['-c', '10', '-g', 'point', '-d', '2', '-t', 'uniform', '-f', 'csv',
+             '-o', 'tcp://127.0.0.1:{}'.format(port)], tmp_path)
+    assert e.value.code == 1
+    assert 'Cannot open the output' in capsys.readouterr().err
+
+@pytest.mark.parametrize('argv', [
+    ['-g', 'point', '-d', '2', '-t', 'uniform', '-f', 'csv', '-o', 'data'],
+    ['-c', '10', '-g', 'point', '-t', 'uniform', '-f', 'csv', '-o', 'data'],
+    ['-c', '10', '-g', 'point', '-d', '2', '-t', 'uniform', '-f', 'csv'],
+    ['-c', '10', '-g', 'point', '-d', '2', '-t', 'uniform', '-f', 'csv', '-z', 'gzip'],
+    ['-c', '10', '-g', 'point', '-d', '2', '-t', 'uniform', '-f', 'csv', '-o', 'tcp://localhost'],
+    ['-c', '10', '-g', 'point', '-d', '2', '-t', 'uniform', '-f', 'csv', '-o', '-', '-z', 'gzip'],
+    ['-c', '10', '-g', 'rectangle', '-d', '3', '-t', 'uniform', '-f', 'wkt', '-s', '0.1', '-o', 'data'],
+    ['-c', '10', '-g', 'rectangle', '-d', '3', '-t', 'uniform', '-f', 'csv', '-s', '0.1,0.2', '-o', 'data'],
+    ['-c', '10', '-g', 'point', '-d', '2', '-t', 'uniform', '-f', 'csv', '-a', '1,0,0', '-o', 'data'],
+    ['-c', '10', '-g', 'point', '-d', '3', '-t', 'sierpinski', '-f', 'csv', '-o', 'data'],
+    ['-c', '10', '-g', 'point', '-d', '2', '-t', 'zipf', '--clusters', '5', '--sigma', '0.1', '-f', 'csv',
+     '-o', 'data'],
+    ['-c', '10', '-g', 'point', '-d', '2', '-t', 'cluster', '--clusters', '0', '--sigma', '0.1', '-f', 'csv',
+     '-o', 'data'],
+])
+def test_rejected_options(tmp_path, argv):
+    with pytest.raises(SystemExit) as e:
+        run(argv, tmp_path)
+    assert e.value.code == 1
+    assert not (tmp_path / 'data.csv').exists() and not (tmp_path / 'data.wkt').exists()
+
+
+def test_generator2_arguments(tmp_path):
+    import generator2
+
+    generator2.generate(str(tmp_path / 'data'), 'uniform', 20, 2, 0.1, 0.2, 0, 0, 1, 0, 0.5, 0, 1, 0)
+    rows = read_rows((tmp_path / 'data.csv').read_text())
+    assert len(rows) == 20
+    assert all(row[0] >= 0.5 and row[2] - row[0] == pytest.approx(0.1) and row[3] - row[1] == pytest.approx(0.2)
+               for row in rows)
@@ -0,0 +1,167 @@
+import math
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from spatialdatagenerators import (BitGenerator, ClusterGenerator, DiagonalGenerator, ParcelGenerator,
+                                   SierpinskiGenerator, ZipfGenerator, generate_boxes, generate_points)
+from spatialdatagenerators.generators import alias_table
+
+
+class SequenceRandom:
+    """
+    Stands for both the random module and a numpy Generator, returning the same values in the same order
+    """
+
+    def __init__(self, values):
+        self.values = iter(values)
+
+    def random(self):
+        return next(self.values)
+
+    def uniform(self, a, b, size=None):
+        if size is None:
+            return a + (b - a) * next(self.values)
+        values = [next(self.values) for _ in range(int(np.prod(size)))]
+        return a + (b - a) * np.array(values).reshape(size)
+
+
+def test_sierpinski_batches_follow_the_recurrence():
+    generator = SierpinskiGenerator(300, 'point', 2, 'sierpinski', None, None)
+    points = np.concatenate(list(generator.generate_arrays(np.random.default_rng(3), batch_size=50)))
+
+    # Replay the same draws one point at a time, the first batch starts with the three vertices
+    vertices = [[0.0, 0.0], [1.0, 0.0], [0.5, math.sqrt(3) / 2]]
+    rng = np.random.default_rng(3)
+    draws = np.concatenate([rng.random(47)] + [rng.random(50) for _ in range(5)])
+    expected = list(vertices)
+    for u in draws:
+        vertex = vertices[[0, 0, 1, 1, 2][int(math.floor(u * 5))]]
+        expected.append([(expected[-1][0] + vertex[0]) / 2, (expected[-1][1] + vertex[1]) / 2])
+
+    assert points.shape == (300, 2)
+    assert np.abs(points - np.array(expected)).max() < 1e-12
+
+
+def test_sierpinski_batch_starts_from_the_vertices():
+    generator = SierpinskiGenerator(2, 'point', 2, 'sierpinski', None, None)
+    assert generator.generate_batch(np.random.default_rng(0), 2).tolist() == [[0.0, 0.0], [1.0, 0.0]]
+
+
+@pytest.mark.parametrize('card', [1, 2, 7, 64, 100])
+def test_parcel_array_splits_like_the_queue(card):
+    values = np.random.default_rng(card).random(3 * card).tolist()
+
+    generator = ParcelGenerator(card, 'rectangle', 2, 'parcel', None, None, 0.2, 0.3)
+    generator.random = SequenceRandom(values)
+    records = [b.coordinates + b.upper_coordinates() for b in generator.generate()]
+
+    generator = ParcelGenerator(card, 'rectangle', 2, 'parcel', None, None, 0.2, 0.3)
+    boxes = generator.generate_array(SequenceRandom(values))
+
+    assert boxes.shape == (card, 4)
+    assert np.abs(boxes - np.array(records)).max() < 1e-12
+
+
+def test_parcel_without_dither_tiles_the_unit_square():
+    boxes = generate_boxes('parcel', 1000, seed=0, split_range=0.2, dither=0.0)
+    assert np.prod(boxes[:, 2:] - boxes[:, :2], axis=1).sum() == pytest.approx(1.0)
+    assert boxes.min() >= 0.0 and boxes.max() <= 1.0
+
+
+def test_diagonal_batch():
+    generator = DiagonalGenerator(10, 'point', 3, 'diagonal', None, None, 1.0, 0.5)
+    on_line = generator.generate_batch(np.random.default_rng(0), 1000)
+    assert np.all(on_line == on_line[:, :1])
+
+    # Off the line, the coordinates alternate between c + d / sqrt(2) and c - d / sqrt(2)
+    generator = DiagonalGenerator(10, 'point', 3, 'diagonal', None, None, 0.0, 0.5)
+    off_line = generator.generate_batch(np.random.default_rng(0), 1000)
+    assert np.all(off_line[:, 0] == off_line[:, 2])
+    centers = (off_line[:, 0] + off_line[:, 1]) / 2
+    assert centers.min() >= 0 and centers.max() < 1
+    assert np.std(off_line[:, 0] - off_line[:, 1]) / math.sqrt(2) == pytest.approx(0.1, rel=0.1)
+
+
+def test_bit_batch():
+    generator = BitGenerator(10, 'point', 2, 'bit', None, None, 0.3, 6)
+    points = generator.generate_batch(np.random.default_rng(0), 100000)
+    assert np.all(points * 64 == np.round(points * 64))
+    assert points.mean() == pytest.approx(0.3 * (1 - 1 / 64), abs=0.005)
+
+
+@pytest.mark.parametrize('dist,params', [
+    ('uniform', {}),
+    ('diagonal', {'percentage': 0.5, 'buffer': 0.5}),
+    ('gaussian', {}),
+    ('bit', {'prob': 0.2, 'digits': 10}),
+    ('cluster', {'clusters': 100, 'sigma': 0.05}),
+    ('zipf', {'clusters': 100, 'sigma': 0.05, 'skew': 1.0}),
+])
+def test_generate_points(dist, params):
+    points = generate_points(dist, 1000, dim=3, seed=0, **params)
+    assert points.shape == (1000, 3) and points.flags['C_CONTIGUOUS']
+    assert points.min() >= 0 and points.max() <= 1
+    assert np.array_equal(points, generate_points(dist, 1000, dim=3, seed=0, **params))
+
+
+def test_generate_boxes_checks_the_size():
+    boxes = generate_boxes('uniform', 5, dim=3, seed=0, size=[0.1, 0.2, 0.3])
+    assert np.allclose(boxes[:, 3:] - boxes[:, :3], [0.1, 0.2, 0.3])
+    with pytest.raises(ValueError, match='Expected 1 or 3 box sizes'):
+        generate_boxes('uniform', 2, dim=3, size=[0.1, 0.2])
+
+
+def test_alias_table_keeps_the_weights():
+    weights = [1.0 / math.pow(i, 1.2) for i in range(1, 51)]
+    probabilities, aliases = alias_table(weights)
+
+    # The share of i is its own bucket plus the rest of the buckets aliased to it
+    shares = list(probabilities)
+    for i, alias in enumerate(aliases):
+        if alias != i:
+            shares[alias] += 1 - probabilities[i]
+    assert np.allclose(np.array(shares) / len(weights), np.array(weights) / sum(weights))
+
+
+def test_zipf_selection_frequencies():
+    generator = ZipfGenerator(10, 'point', 2, 'zipf', None, None, 4, 0.01, 1.0)
+    expected = np.array([1, 1 / 2, 1 / 3, 1 / 4]) / (1 + 1 / 2 + 1 / 3 + 1 / 4)
+
+    batch = np.bincount(generator.select_clusters(np.random.default_rng(0), 200000), minlength=4) / 200000
+    records = np.bincount([generator.select_cluster() for _ in range(200000)], minlength=4) / 200000
+    assert np.allclose(batch, expected, atol=0.005)
+    assert np.allclose(records, expected, atol=0.005)
+
+
+@pytest.mark.parametrize('generator_class,params', [
+    (ClusterGenerator, (0, 0.1)),
+    (ClusterGenerator, (3, -0.1)),
+    (ZipfGenerator, (3, 0.1, -1.0)),
+])
+def test_mixture_checks_its_parameters(generator_class, params):
+    with pytest.raises(ValueError):
+        generator_class(10, 'point', 2, 'cluster', None, None, *params)
+
+
+def test_diagonal_rot_rotates_the_line():
+    points = generate_points('diagonal_rot', 1000, seed=0, percentage=1.0, buffer=0.1, angle=90)
+    assert np.allclose(points[:, 0] + points[:, 1], 1.0)
+
+
+@pytest.mark.parametrize('generator_class,params', [
+    (ClusterGenerator, (5, 0.01)),
+    (ZipfGenerator, (5, 0.01, 1.0)),
+])
+def test_mixture_draws_its_centers_for_each_run(generator_class, params):
+    generator = generator_class(100, 'point', 2, 'cluster', None, None, *params)
+    first = generator.generate_array(np.random.default_rng(1))
+    assert not np.allclose(first.mean(axis=0), generator.generate_array(np.random.default_rng(2)).mean(axis=0))
+    assert np.array_equal(first, generator.generate_array(np.random.default_rng(1)))
+
+    generator.random = random.Random(1)
+    records = [p.coordinates for p in generator.generate()]
+    generator.random = random.Random(1)
+    assert records == [p.coordinates for p in generator.generate()]